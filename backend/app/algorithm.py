@@ -1,6 +1,8 @@
 """Garden placement algorithm — 2D block-based layout with companion planting."""
 
 import math
+from typing import Callable
+
 from sqlalchemy.orm import Session
 
 from .models import Association, Vegetable
@@ -8,32 +10,60 @@ from .schemas import GenerateRequest, GenerateResponse, PlacedVegetable
 
 
 def generate_plan(req: GenerateRequest, db: Session) -> GenerateResponse:
-    W = req.width_cm // 5   # grid width in 5cm cells
-    H = req.height_cm // 5  # grid height in 5cm cells
+    sizes, assoc_scores, min_distances = load_plan_inputs(req, db)
+    return solve_plan(req, sizes, assoc_scores, min_distances)
+
+
+def load_plan_inputs(
+    req: GenerateRequest, db: Session,
+) -> tuple[dict[int, tuple[int, int]], dict[tuple[int, int], int], dict[tuple[int, int], int]]:
+    """Load what the solver needs from the database as plain, picklable data.
 
-    # Load vegetables
-    veg_map: dict[int, Vegetable] = {}
+    Returns: ({veg_id: (grid_width, grid_height)}, {(main, target): score},
+    {(main, target): min_distance_cm} for associations that set one)
+    """
+    sizes: dict[int, tuple[int, int]] = {}
     for item in req.items:
         v = db.get(Vegetable, item.vegetable_id)
         if v:
-            veg_map[item.vegetable_id] = v
+            sizes[item.vegetable_id] = (v.grid_width, v.grid_height)
 
-    # Load association scores
     assoc_scores: dict[tuple[int, int], int] = {}
-    all_ids = list(veg_map.keys())
+    min_distances: dict[tuple[int, int], int] = {}
+    all_ids = list(sizes.keys())
     for a in db.query(Association).filter(
         Association.vegetable_id_main.in_(all_ids),
         Association.vegetable_id_target.in_(all_ids),
     ).all():
         assoc_scores[(a.vegetable_id_main, a.vegetable_id_target)] = a.score
+        if a.min_distance_cm:
+            min_distances[(a.vegetable_id_main, a.vegetable_id_target)] = a.min_distance_cm
+
+    return sizes, assoc_scores, min_distances
+
+
+def solve_plan(
+    req: GenerateRequest,
+    sizes: dict[int, tuple[int, int]],
+    assoc_scores: dict[tuple[int, int], int],
+    min_distances: dict[tuple[int, int], int] | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> GenerateResponse:
+    """Run the placement itself. Needs no database, so it can run in a worker.
+
+    progress, if given, is called as progress(blocks_done, blocks_total)
+    before each block, before each sub-group of a block that does not fit
+    whole, and once at the end; it may raise to abort the solve.
+    """
+    W = req.width_cm // 5   # grid width in 5cm cells
+    H = req.height_cm // 5  # grid height in 5cm cells
 
     # Build vegetable blocks: each vegetable type = one rectangular block
     blocks: list[dict] = []
     for item in req.items:
-        v = veg_map.get(item.vegetable_id)
-        if not v:
+        if item.vegetable_id not in sizes:
             continue
-        pw, ph = v.grid_width, v.grid_height
+        pw, ph = sizes[item.vegetable_id]
         if pw > W or ph > H:
             continue
         qty = item.quantity
@@ -64,67 +94,63 @@ def generate_plan(req: GenerateRequest, db: Session) -> GenerateResponse:
     # 2D occupancy grid: grid[y][x] = veg_id or 0 (free)
     grid: list[list[int]] = [[0] * W for _ in range(H)]
 
+    # Minimum spacing: min_gaps[veg_id] = [(enemy_id, gap in cells)], and one
+    # distance field per enemy class, updated as its blocks land.
+    min_gaps = _build_min_gaps(min_distances or {}, sizes.keys())
+    fields = _init_distance_fields(min_gaps, W, H)
+
     placed: list[PlacedVegetable] = []
     rejected: list[int] = []
 
-    for block in blocks:
+    for done, block in enumerate(blocks):
+        if progress is not None:
+            progress(done, len(blocks))
         veg_id = block["veg_id"]
         pw, ph = block["pw"], block["ph"]
         qty = block["qty"]
         max_per_row = block["per_row"]
 
-        # Try different block arrangements (varying columns per row)
-        # from widest to narrowest
-        placed_block = False
-        for cols in range(min(qty, max_per_row), 0, -1):
-            rows_needed = math.ceil(qty / cols)
-            bw = cols * pw
-            bh = rows_needed * ph
-
-            pos = _find_block_position(grid, W, H, veg_id, bw, bh, assoc_scores)
-            if pos is not None:
-                bx, by = pos
-                _place_block(grid, placed, bx, by, veg_id, pw, ph, cols, qty)
-                placed_block = True
-                break
-
-        if placed_block:
+        spacing = _spacing_for(veg_id, min_gaps, fields)
+
+        # Widest block arrangement (varying columns per row) that fits
+        free = _free_mask(grid, W, H, spacing)
+        runs = _right_runs(free, W, H)
+        found = _find_arrangement(
+            grid, runs, W, H, veg_id, pw, ph, qty, max_per_row, assoc_scores,
+        )
+        if found is not None:
+            cols, bx, by = found
+            _place_block(grid, placed, bx, by, veg_id, pw, ph, cols, qty, fields)
             continue
 
-        # No full block arrangement fits — try placing sub-groups
+        # No full block arrangement fits — place the largest sub-group that
+        # does (its widest arrangement is then guaranteed to fit), until
+        # none is left or no pw x ph spot remains
         remaining = qty
         while remaining > 0:
-            placed_any = False
-
-            # Try sub-groups from largest to smallest, with varying columns
-            for sub_qty in range(remaining, 0, -1):
-                found = False
-                for cols in range(min(sub_qty, max_per_row), 0, -1):
-                    sub_rows = math.ceil(sub_qty / cols)
-                    sub_w = cols * pw
-                    sub_h = sub_rows * ph
-
-                    pos = _find_block_position(
-                        grid, W, H, veg_id, sub_w, sub_h, assoc_scores
-                    )
-                    if pos is not None:
-                        bx, by = pos
-                        actual_placed = _place_block(
-                            grid, placed, bx, by, veg_id, pw, ph, cols, sub_qty
-                        )
-                        remaining -= actual_placed
-                        placed_any = True
-                        found = True
-                        break
-                if found:
-                    break
-
-            if not placed_any:
+            if progress is not None:
+                progress(done, len(blocks))
+            sub_qty = _max_placeable(free, W, H, pw, ph, max_per_row, remaining)
+            if sub_qty == 0:
                 rejected.extend([veg_id] * remaining)
                 break
 
+            cols, bx, by = _find_arrangement(
+                grid, runs, W, H, veg_id, pw, ph, sub_qty, max_per_row,
+                assoc_scores,
+            )
+            remaining -= _place_block(
+                grid, placed, bx, by, veg_id, pw, ph, cols, sub_qty, fields
+            )
+            free = _free_mask(grid, W, H, spacing)
+            runs = _right_runs(free, W, H)
+
+    if progress is not None:
+        progress(len(blocks), len(blocks))
     global_score = _compute_global_score(placed, assoc_scores)
-    return GenerateResponse(placed=placed, rejected=rejected, global_score=global_score)
+    return GenerateResponse.model_construct(
+        placed=placed, rejected=rejected, global_score=global_score
+    )
 
 
 def _order_blocks_by_association(
@@ -162,40 +188,293 @@ def _order_blocks_by_association(
     return ordered
 
 
-def _find_block_position(
+def _build_min_gaps(
+    min_distances: dict[tuple[int, int], int],
+    veg_ids,
+) -> dict[int, list[tuple[int, int]]]:
+    """Turn {(a, b): min_distance_cm} into {a: [(b, gap_cells)]}.
+
+    Constraints are made symmetric (the larger distance wins) and only kept
+    for vegetables in the request. A gap of N cells means at least N free
+    cells between the two plants; adjacent plants have a gap of 0.
+    """
+    ids = set(veg_ids)
+    gaps: dict[tuple[int, int], int] = {}
+    for (a, b), cm in min_distances.items():
+        if a not in ids or b not in ids or cm <= 0:
+            continue
+        cells = math.ceil(cm / 5)
+        for pair in ((a, b), (b, a)):
+            gaps[pair] = max(gaps.get(pair, 0), cells)
+
+    min_gaps: dict[int, list[tuple[int, int]]] = {}
+    for (a, b), cells in gaps.items():
+        min_gaps.setdefault(a, []).append((b, cells))
+    return min_gaps
+
+
+def _init_distance_fields(
+    min_gaps: dict[int, list[tuple[int, int]]],
+    W: int, H: int,
+) -> dict[int, tuple[int, list[list[int]]]]:
+    """Create an empty distance field for every vegetable some other
+    vegetable must keep away from.
+
+    fields[enemy_id] = (cap, field) where field[y][x] is the Chebyshev
+    distance from (x, y) to the nearest cell of enemy_id, clamped to cap
+    (one more than the largest gap anyone needs from that enemy, so a
+    clamped cell is always far enough).
+    """
+    caps: dict[int, int] = {}
+    for constraints in min_gaps.values():
+        for enemy_id, cells in constraints:
+            caps[enemy_id] = max(caps.get(enemy_id, 0), cells + 1)
+    return {
+        enemy_id: (cap, [[cap] * W for _ in range(H)])
+        for enemy_id, cap in caps.items()
+    }
+
+
+def _update_distance_field(
+    field: list[list[int]], cap: int,
+    W: int, H: int,
+    x: int, y: int, w: int, h: int,
+) -> None:
+    """Lower the field around a newly occupied rectangle.
+
+    Only the rectangle grown by cap is touched, so the cost is
+    O((w + 2*cap) * (h + 2*cap)) per block, not O(grid).
+    """
+    x_end, y_end = x + w - 1, y + h - 1
+    for ny in range(max(0, y - cap), min(H, y_end + cap + 1)):
+        dy = y - ny if ny < y else max(0, ny - y_end)
+        row = field[ny]
+        for nx in range(max(0, x - cap), min(W, x_end + cap + 1)):
+            dx = x - nx if nx < x else max(0, nx - x_end)
+            d = dx if dx > dy else dy
+            if d < row[nx]:
+                row[nx] = d
+
+
+def _free_mask(
+    grid: list[list[int]],
+    W: int, H: int,
+    spacing: list[tuple[list[list[int]], int]],
+) -> list[list[int]]:
+    """Grid of cells a block may cover: non-zero where the cell is occupied
+    or closer to an enemy than its minimum spacing allows.
+
+    A plant on a cell at distance d from an enemy leaves d - 1 free cells
+    between them, so the cell is ruled out when d <= gap. Without spacing
+    the occupancy grid itself is the mask.
+    """
+    if not spacing:
+        return grid
+    mask = []
+    for y in range(H):
+        row = grid[y]
+        out = [1 if v else 0 for v in row]
+        for field, cells in spacing:
+            frow = field[y]
+            for x in range(W):
+                if frow[x] <= cells:
+                    out[x] = 1
+        mask.append(out)
+    return mask
+
+
+def _right_runs(grid: list[list[int]], W: int, H: int) -> list[list[int]]:
+    """runs[y][x] = number of consecutive free cells from (x, y) rightwards.
+
+    A w x h rectangle at (x, y) is free iff runs[y + i][x] >= w for all i < h.
+    """
+    runs = []
+    for y in range(H):
+        row = grid[y]
+        out = [0] * W
+        run = 0
+        for x in range(W - 1, -1, -1):
+            run = run + 1 if row[x] == 0 else 0
+            out[x] = run
+        runs.append(out)
+    return runs
+
+
+def _max_placeable(
+    grid: list[list[int]],
+    W: int, H: int,
+    pw: int, ph: int,
+    max_per_row: int,
+    limit: int,
+) -> int:
+    """Largest number of pw x ph plants (at most limit) that fit as one block
+    in the free cells (0) of grid.
+
+    An empty w x h rectangle holds min(w // pw, max_per_row) * (h // ph)
+    plants, which grows with both sides, so only maximal empty rectangles
+    matter. They are enumerated with the usual histogram stack: one pass per
+    row over the heights of free cells above it, O(W * H) in total.
+    """
+    best = 0
+    heights = [0] * W
+    for y in range(H):
+        row = grid[y]
+        for x in range(W):
+            heights[x] = heights[x] + 1 if row[x] == 0 else 0
+        stack: list[tuple[int, int]] = []  # (start x, height), heights increasing
+        for x in range(W + 1):
+            h = heights[x] if x < W else 0
+            start = x
+            while stack and stack[-1][1] >= h:
+                start, bar = stack.pop()
+                fits = min((x - start) // pw, max_per_row) * (bar // ph)
+                if fits > best:
+                    best = fits
+                    if best >= limit:
+                        return limit
+            stack.append((start, h))
+    return best
+
+
+def _find_arrangement(
+    grid: list[list[int]],
+    runs: list[list[int]],
+    W: int, H: int,
+    veg_id: int, pw: int, ph: int,
+    qty: int, max_per_row: int,
+    assoc_scores: dict[tuple[int, int], int],
+) -> tuple[int, int, int] | None:
+    """Find the widest arrangement of qty plants that fits, and where.
+
+    runs comes from _right_runs over the block's free mask, so minimum
+    spacing is already accounted for. All arrangements (cols = min(qty,
+    max_per_row) down to 1) are matched against it in a single sweep; only
+    the widest that fits is scored position by position.
+
+    Returns: (cols, x, y) or None
+    """
+    shapes = []
+    for cols in range(min(qty, max_per_row), 0, -1):
+        shapes.append((cols, cols * pw, math.ceil(qty / cols) * ph))
+
+    k, origins = _widest_fit_origins(runs, W, H, shapes)
+    if not origins:
+        return None
+
+    cols, bw, bh = shapes[k]
+    x, y = _best_position(grid, W, H, veg_id, bw, bh, origins, assoc_scores)
+    return cols, x, y
+
+
+def _widest_fit_origins(
+    runs: list[list[int]],
+    W: int, H: int,
+    shapes: list[tuple[int, int, int]],
+) -> tuple[int, list[tuple[int, int]]]:
+    """Find the first (widest) shape that fits somewhere, and every origin
+    where it fits.
+
+    shapes are (cols, w, h) with w decreasing and h non-decreasing. Each
+    column is swept bottom-up with a monotone stack of (min run, rows)
+    segments: the largest empty rectangles with their top-left corner at
+    (x, y). A segment of width v spanning heights h_lo..h_hi holds shape k
+    iff w_k <= v and h_lo <= h_k <= h_hi, which two lookup tables answer in
+    O(1), so all shapes are tested in one O(W * H) pass.
+
+    Returns: (shape index, [(x, y), ...]); the list is empty if none fits.
+    """
+    n = len(shapes)
+    # first_by_height[h] = first shape at least h tall
+    first_by_height = []
+    k = 0
+    for h in range(H + 2):
+        while k < n and shapes[k][2] < h:
+            k += 1
+        first_by_height.append(k)
+    # first_by_width[v] = first shape at most v wide
+    first_by_width = [n] * (W + 1)
+    k = 0
+    for v in range(W, -1, -1):
+        while k < n and shapes[k][1] > v:
+            k += 1
+        first_by_width[v] = k
+
+    best = n
+    origins: list[tuple[int, int]] = []
+    for x in range(W):
+        stack: list[tuple[int, int]] = []  # top of stack = row y
+        for y in range(H - 1, -1, -1):
+            v0 = runs[y][x]
+            if v0 == 0:
+                stack.clear()
+                continue
+            rows = 1
+            while stack and stack[-1][0] >= v0:
+                rows += stack.pop()[1]
+            stack.append((v0, rows))
+
+            height = 0
+            for i in range(len(stack) - 1, -1, -1):
+                v, rows = stack[i]
+                # segments further down only admit later (narrower) shapes
+                k = max(first_by_height[height + 1], first_by_width[v])
+                if k > best or k >= n:
+                    break
+                height += rows
+                if shapes[k][2] <= height:
+                    if k < best:
+                        best = k
+                        origins = []
+                    origins.append((x, y))
+                    break
+
+    return best, origins
+
+
+def _spacing_for(
+    veg_id: int,
+    min_gaps: dict[int, list[tuple[int, int]]] | None,
+    fields: dict[int, tuple[int, list[list[int]]]] | None,
+) -> list[tuple[list[list[int]], int]]:
+    """Only the constraints whose enemy has a field (i.e. is in the request)."""
+    return [
+        (fields[enemy_id][1], cells)
+        for enemy_id, cells in (min_gaps or {}).get(veg_id, [])
+        if fields and enemy_id in fields
+    ]
+
+
+def _best_position(
     grid: list[list[int]],
     W: int, H: int,
     veg_id: int,
     block_w: int, block_h: int,
+    candidates,
     assoc_scores: dict[tuple[int, int], int],
 ) -> tuple[int, int] | None:
-    """Find the best position for a rectangular block on the grid.
+    """Pick the best of the given free positions for a block (candidates
+    already respect occupancy and minimum spacing).
 
     Strategy:
-    1. Must not overlap existing plants
-    2. Strongly prefer no enemies, but accept them as last resort
-    3. Prefer positions adjacent to same vegetable (grouping)
-    4. Prefer positions with good association scores
-    5. Prefer top-left for compact layout
+    1. Strongly prefer no enemies, but accept them as last resort
+    2. Prefer positions adjacent to same vegetable (grouping)
+    3. Prefer positions with good association scores
+    4. Prefer top-left for compact layout
     """
     best_pos = None
     best_score = None
 
-    for y in range(H - block_h + 1):
-        for x in range(W - block_w + 1):
-            if not _area_free(grid, x, y, block_w, block_h):
-                continue
-
-            neighbor_score, has_enemy, has_same = _evaluate_neighbors(
-                grid, W, H, x, y, block_w, block_h, veg_id, assoc_scores
-            )
+    for x, y in candidates:
+        neighbor_score, has_enemy, has_same = _evaluate_neighbors(
+            grid, W, H, x, y, block_w, block_h, veg_id, assoc_scores
+        )
 
-            # Score: no_enemy > has_enemy, then grouping, then assoc, then top-left
-            score = (not has_enemy, has_same, neighbor_score, -y, -x)
+        # Score: no_enemy > has_enemy, then grouping, then assoc, then top-left
+        score = (not has_enemy, has_same, neighbor_score, -y, -x)
 
-            if best_score is None or score > best_score:
-                best_score = score
-                best_pos = (x, y)
+        if best_score is None or score > best_score:
+            best_score = score
+            best_pos = (x, y)
 
     return best_pos
 
@@ -206,6 +485,7 @@ def _place_block(
     bx: int, by: int,
     veg_id: int, pw: int, ph: int,
     per_row: int, qty: int,
+    fields: dict[int, tuple[int, list[list[int]]]] | None = None,
 ) -> int:
     """Place plants in a rectangular block starting at (bx, by).
     Returns the number of plants actually placed."""
@@ -221,7 +501,8 @@ def _place_block(
             for dx in range(pw):
                 grid[y + dy][x + dx] = veg_id
 
-        placed.append(PlacedVegetable(
+        # Built from trusted ints: skip pydantic validation
+        placed.append(PlacedVegetable.model_construct(
             vegetable_id=veg_id, x=x, y=y, w=pw, h=ph
         ))
         count += 1
@@ -230,17 +511,20 @@ def _place_block(
             col = 0
             row += 1
 
-    return count
-
+    if fields and veg_id in fields:
+        cap, field = fields[veg_id]
+        H, W = len(grid), len(grid[0])
+        full_rows, last = divmod(count, per_row)
+        if full_rows:
+            _update_distance_field(
+                field, cap, W, H, bx, by, per_row * pw, full_rows * ph
+            )
+        if last:
+            _update_distance_field(
+                field, cap, W, H, bx, by + full_rows * ph, last * pw, ph
+            )
 
-def _area_free(grid: list[list[int]], x: int, y: int, w: int, h: int) -> bool:
-    """Check if a rectangular area is entirely free on the grid."""
-    for dy in range(h):
-        row = grid[y + dy]
-        for dx in range(w):
-            if row[x + dx] != 0:
-                return False
-    return True
+    return count
 
 
 def _evaluate_neighbors(
@@ -286,19 +570,36 @@ def _compute_global_score(
     placed: list[PlacedVegetable],
     assoc_scores: dict[tuple[int, int], int],
 ) -> float:
-    """Sum association scores between all adjacent placed vegetables."""
+    """Sum association scores between all adjacent placed vegetables.
+
+    Placements are bucketed on a grid of side larger than any plant, so a
+    placement is only compared with those in the 3x3 surrounding buckets
+    (adjacency allows a gap of at most 1 cell).
+    """
+    if not placed:
+        return 0.0
+    size = max(max(p.w, p.h) for p in placed) + 1
+    buckets: dict[tuple[int, int], list[int]] = {}
+    for i, p in enumerate(placed):
+        buckets.setdefault((p.x // size, p.y // size), []).append(i)
+
     total = 0.0
-    seen: set[tuple[int, int]] = set()
-    for i in range(len(placed)):
-        for j in range(i + 1, len(placed)):
-            if _are_adjacent(placed[i], placed[j]):
-                pair = (min(i, j), max(i, j))
-                if pair not in seen:
-                    seen.add(pair)
-                    s = assoc_scores.get(
-                        (placed[i].vegetable_id, placed[j].vegetable_id), 0
-                    )
-                    total += s
+    for (bx, by), members in buckets.items():
+        candidates = [
+            j
+            for dy in (-1, 0, 1)
+            for dx in (-1, 0, 1)
+            for j in buckets.get((bx + dx, by + dy), ())
+        ]
+        for i in members:
+            a = placed[i]
+            for j in candidates:
+                # each pair once
+                if j <= i:
+                    continue
+                b = placed[j]
+                if _are_adjacent(a, b):
+                    total += assoc_scores.get((a.vegetable_id, b.vegetable_id), 0)
     return total
 
 
@@ -0,0 +1,90 @@
+"""Negotiated gzip / brotli compression for large responses."""
+
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import BROTLI_QUALITY, COMPRESSION_MIN_SIZE, GZIP_LEVEL
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+
+def _pick_encoding(accept_encoding: str) -> str | None:
+    """Return the best encoding offered by the client, brotli first."""
+    offered: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if token:
+            offered[token.strip().lower()] = q
+    if brotli is not None and offered.get("br", 0) > 0:
+        return "br"
+    if offered.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """Compress response bodies above ``minimum_size`` bytes.
+
+    The body is buffered before deciding, which is fine for our JSON
+    endpoints (none of them stream).
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = _pick_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        chunks: list[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            headers = MutableHeaders(raw=start["headers"])
+            if len(body) >= self.minimum_size and "content-encoding" not in headers:
+                body = _compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
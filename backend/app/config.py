@@ -0,0 +1,35 @@
+"""Runtime settings, overridable through environment variables."""
+
+import os
+
+# Responses smaller than this (in bytes) are sent uncompressed.
+COMPRESSION_MIN_SIZE = int(os.environ.get("GARDENGEN_COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.environ.get("GARDENGEN_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("GARDENGEN_BROTLI_QUALITY", "4"))
+
+# Generate cost budget (see app/cost.py). One predicted "op" is roughly one
+# grid-cell visit in the solver; measured runs do 2.5e6-4e7 ops per second,
+# about 1e7 typically. Requests predicted below COST_INLINE_MAX_OPS (~0.2 s)
+# are solved inline, the rest go to the worker pool; anything above
+# COST_MAX_OPS (~5 s typical, ~20 s at the slowest measured rate, well
+# under a 60 s proxy timeout) or COST_MAX_MEMORY_BYTES is rejected.
+COST_INLINE_MAX_OPS = int(float(os.environ.get("GARDENGEN_COST_INLINE_MAX_OPS", "2e6")))
+COST_MAX_OPS = int(float(os.environ.get("GARDENGEN_COST_MAX_OPS", "5e7")))
+COST_MAX_MEMORY_BYTES = int(float(os.environ.get("GARDENGEN_COST_MAX_MEMORY_BYTES", "512e6")))
+WORKER_PROCESSES = int(os.environ.get("GARDENGEN_WORKER_PROCESSES", "0")) or None  # None = cpu count
+
+# Association-graph decomposition (see app/decompose.py), used for
+# requests over COST_MAX_OPS that would otherwise be rejected. Items linked
+# (directly or through others) by an association score of at least
+# DECOMPOSE_MIN_SCORE share a region; the garden is only split between
+# groups with no such link.
+DECOMPOSE_MIN_SCORE = int(os.environ.get("GARDENGEN_DECOMPOSE_MIN_SCORE", "1"))
+DECOMPOSE_MAX_CLUSTERS = int(os.environ.get("GARDENGEN_DECOMPOSE_MAX_CLUSTERS", "8"))
+
+# Background generate jobs run in their own pool of JOB_WORKER_PROCESSES and,
+# having no proxy timeout to meet, get a larger budget (~15-60 min at the
+# rates above). Finished jobs (done, failed, cancelled) are deleted after
+# JOB_TTL_SECONDS.
+JOB_WORKER_PROCESSES = int(os.environ.get("GARDENGEN_JOB_WORKER_PROCESSES", "2"))
+JOB_MAX_OPS = int(float(os.environ.get("GARDENGEN_JOB_MAX_OPS", "1e10")))
+JOB_TTL_SECONDS = int(os.environ.get("GARDENGEN_JOB_TTL_SECONDS", "86400"))
@@ -1,5 +1,5 @@
 from pathlib import Path
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
 from .models import Base
 
@@ -10,6 +10,18 @@ SessionLocal = sessionmaker(bind=engine)
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+
+
+def _add_missing_columns():
+    """create_all does not alter existing tables: add columns introduced
+    after a database was first created."""
+    columns = {c["name"] for c in inspect(engine).get_columns("associations")}
+    if "min_distance_cm" not in columns:
+        with engine.begin() as conn:
+            conn.execute(text(
+                "ALTER TABLE associations ADD COLUMN min_distance_cm INTEGER NOT NULL DEFAULT 0"
+            ))
 
 
 def get_db():
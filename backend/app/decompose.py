@@ -0,0 +1,183 @@
+"""Split a generate request into independent regions along the association graph.
+
+Items are grouped into the connected components of their friendly
+associations, so no link of DECOMPOSE_MIN_SCORE or more is ever cut.
+Each cluster gets a
+sub-rectangle of the garden sized to its area demand, and the clusters are
+solved separately (in parallel in the worker pool if asked). The results are then
+stitched back together and scored as a whole with _compute_global_score, so
+scores across region boundaries still count. A region's shape still changes
+how its blocks pack, so this is for requests too expensive to solve
+undivided, not a replacement for the undivided search.
+"""
+
+import math
+import os
+
+from .algorithm import _compute_global_score, solve_plan
+from .cost import estimate_cost
+from .config import DECOMPOSE_MAX_CLUSTERS, DECOMPOSE_MIN_SCORE, WORKER_PROCESSES
+from .schemas import GenerateItem, GenerateRequest, GenerateResponse, PlacedVegetable
+from .workers import GENERATE, submit
+
+# (sub-request, x offset, y offset) with offsets in grid cells
+Region = tuple[GenerateRequest, int, int]
+
+
+def plan_regions(
+    req: GenerateRequest,
+    sizes: dict[int, tuple[int, int]],
+    assoc_scores: dict[tuple[int, int], int],
+    min_distances: dict[tuple[int, int], int] | None = None,
+) -> list[Region] | None:
+    """Return one region per cluster, or None when decomposing is not
+    possible or not safe: a single cluster, a region too small for its
+    plants, or a minimum-distance constraint between two clusters
+    (independent solves could not enforce it)."""
+    W = req.width_cm // 5
+    H = req.height_cm // 5
+    items = [i for i in req.items if i.vegetable_id in sizes]
+
+    clusters = _cluster_items(items, sizes, assoc_scores)
+    if len(clusters) <= 1:
+        return None
+
+    cluster_of = {i.vegetable_id: n for n, c in enumerate(clusters) for i in c}
+    for a, b in (min_distances or {}):
+        if a in cluster_of and b in cluster_of and cluster_of[a] != cluster_of[b]:
+            return None
+
+    demands = [_demand(c, sizes) for c in clusters]
+    rects = _allocate(list(range(len(clusters))), demands, 0, 0, W, H)
+
+    regions: list[Region] = []
+    for n, (x, y, w, h) in sorted(rects.items()):
+        cluster = clusters[n]
+        if any(sizes[i.vegetable_id][0] > w or sizes[i.vegetable_id][1] > h for i in cluster):
+            return None
+        # model_construct: regions may be smaller than a user-facing request allows
+        sub = GenerateRequest.model_construct(width_cm=w * 5, height_cm=h * 5, items=cluster)
+        regions.append((sub, x, y))
+    return regions
+
+
+def split_ops(
+    regions: list[Region],
+    sizes: dict[int, tuple[int, int]],
+    min_distances: dict[tuple[int, int], int] | None = None,
+) -> int:
+    """Predicted ops on the critical path of solve_regions(parallel=True).
+
+    Regions share the generate pool, so this is the slowest region or an
+    even share of the total across the pool, whichever is larger.
+    """
+    costs = [estimate_cost(sub, sizes, min_distances).predicted_ops for sub, _, _ in regions]
+    workers = min(len(costs), WORKER_PROCESSES or os.cpu_count() or 1)
+    return max(max(costs), math.ceil(sum(costs) / workers))
+
+
+def solve_regions(
+    regions: list[Region],
+    sizes: dict[int, tuple[int, int]],
+    assoc_scores: dict[tuple[int, int], int],
+    min_distances: dict[tuple[int, int], int] | None = None,
+    parallel: bool = False,
+) -> GenerateResponse:
+    """Solve each region independently (in the generate worker pool when
+    parallel), then stitch and score the result."""
+    args = [(sub, sizes, assoc_scores, min_distances) for sub, _, _ in regions]
+    if parallel:
+        futures = [submit(GENERATE, solve_plan, *a) for a in args]
+        results = [f.result() for f in futures]
+    else:
+        results = [solve_plan(*a) for a in args]
+
+    placed: list[PlacedVegetable] = []
+    rejected: list[int] = []
+    for (_, ox, oy), res in zip(regions, results):
+        for p in res.placed:
+            placed.append(PlacedVegetable.model_construct(
+                vegetable_id=p.vegetable_id, x=p.x + ox, y=p.y + oy, w=p.w, h=p.h
+            ))
+        rejected.extend(res.rejected)
+
+    global_score = _compute_global_score(placed, assoc_scores)
+    return GenerateResponse.model_construct(
+        placed=placed, rejected=rejected, global_score=global_score
+    )
+
+
+def _cluster_items(
+    items: list[GenerateItem],
+    sizes: dict[int, tuple[int, int]],
+    assoc_scores: dict[tuple[int, int], int],
+) -> list[list[GenerateItem]]:
+    """Connected components of the links of at least DECOMPOSE_MIN_SCORE.
+
+    Duplicate items of one vegetable always stay together. If there are
+    more than DECOMPOSE_MAX_CLUSTERS components, the smallest are merged
+    (which joins unrelated items and cuts nothing).
+    """
+    parent = list(range(len(items)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(items)):
+        for j in range(i + 1, len(items)):
+            a, b = items[i].vegetable_id, items[j].vegetable_id
+            score = max(assoc_scores.get((a, b), 0), assoc_scores.get((b, a), 0))
+            if a == b or score >= DECOMPOSE_MIN_SCORE:
+                parent[find(i)] = find(j)
+
+    groups: dict[int, list[GenerateItem]] = {}
+    for i, item in enumerate(items):
+        groups.setdefault(find(i), []).append(item)
+    clusters = list(groups.values())
+
+    while len(clusters) > max(1, DECOMPOSE_MAX_CLUSTERS):
+        clusters.sort(key=lambda c: _demand(c, sizes))
+        smallest = clusters.pop(0)
+        clusters[0] = clusters[0] + smallest
+    return sorted(clusters, key=lambda c: -_demand(c, sizes))
+
+
+def _demand(cluster: list[GenerateItem], sizes: dict[int, tuple[int, int]]) -> int:
+    return sum(i.quantity * sizes[i.vegetable_id][0] * sizes[i.vegetable_id][1] for i in cluster)
+
+
+def _allocate(
+    ids: list[int],
+    demands: list[int],
+    x: int, y: int, w: int, h: int,
+) -> dict[int, tuple[int, int, int, int]]:
+    """Guillotine-split the rectangle between clusters in proportion to their
+    demand: halve the cluster list by demand, cut the longer side, recurse."""
+    if len(ids) == 1:
+        return {ids[0]: (x, y, w, h)}
+
+    left: list[int] = []
+    right: list[int] = []
+    left_demand = right_demand = 0
+    for n in sorted(ids, key=lambda n: -demands[n]):
+        if left_demand <= right_demand:
+            left.append(n)
+            left_demand += demands[n]
+        else:
+            right.append(n)
+            right_demand += demands[n]
+
+    total = left_demand + right_demand
+    frac = left_demand / total if total else 0.5
+    if w >= h:
+        cut = min(max(round(w * frac), 1), w - 1)
+        rects = _allocate(left, demands, x, y, cut, h)
+        rects.update(_allocate(right, demands, x + cut, y, w - cut, h))
+    else:
+        cut = min(max(round(h * frac), 1), h - 1)
+        rects = _allocate(left, demands, x, y, w, cut)
+        rects.update(_allocate(right, demands, x, y + cut, w, h - cut))
+    return rects
@@ -0,0 +1,156 @@
+"""Asynchronous generate jobs, persisted in SQLite.
+
+The API creates a GenerateJob row and hands its id to the worker pool; the
+worker reads the request back from the database, reports progress (blocks
+placed out of total) on the row and stores the result there. Status changes
+are conditional on the current status, which is how cancellation reaches a
+running solve. If a worker process dies, the job it was running is marked
+failed and jobs that had not started yet are dispatched again. Jobs left
+unfinished by a previous server process are restarted on startup.
+"""
+
+import time
+import uuid
+from concurrent.futures import Future
+
+from sqlalchemy.orm import Session
+
+from .algorithm import load_plan_inputs, solve_plan
+from .config import JOB_TTL_SECONDS
+from .cost import estimate_cost
+from .database import SessionLocal
+from .models import GenerateJob
+from .responses import dump_json
+from .schemas import GenerateRequest
+from .workers import JOBS, submit
+
+ACTIVE = ("queued", "running")
+FINISHED = ("done", "failed", "cancelled")
+
+
+class JobCancelled(Exception):
+    """Raised from the progress callback once the job has been cancelled."""
+
+
+def create_job(req: GenerateRequest, db: Session) -> GenerateJob:
+    cleanup_jobs(db)
+    now = time.time()
+    job = GenerateJob(
+        id=uuid.uuid4().hex,
+        status="queued",
+        request_json=req.model_dump_json(),
+        created_at=now,
+        updated_at=now,
+    )
+    db.add(job)
+    # Committed first: the worker reads the job back from the database
+    db.commit()
+    _start(job, db)
+    db.refresh(job)
+    return job
+
+
+def cancel_job(job: GenerateJob, db: Session) -> GenerateJob:
+    if job.status in ACTIVE:
+        job.status = "cancelled"
+        job.updated_at = time.time()
+        db.commit()
+        db.refresh(job)
+    return job
+
+
+def resume_jobs() -> None:
+    """Requeue jobs a previous server process left queued or running.
+    They restart from scratch."""
+    db = SessionLocal()
+    try:
+        jobs = db.query(GenerateJob).filter(GenerateJob.status.in_(ACTIVE)).all()
+        for job in jobs:
+            job.status = "queued"
+            job.progress_done = 0
+            job.updated_at = time.time()
+        db.commit()
+        for job in jobs:
+            _start(job, db)
+    finally:
+        db.close()
+
+
+def cleanup_jobs(db: Session) -> None:
+    """Delete finished jobs older than JOB_TTL_SECONDS."""
+    cutoff = time.time() - JOB_TTL_SECONDS
+    db.query(GenerateJob).filter(
+        GenerateJob.status.in_(FINISHED),
+        GenerateJob.updated_at < cutoff,
+    ).delete(synchronize_session=False)
+    db.commit()
+
+
+def run_job(job_id: str) -> None:
+    """Worker entry point: solve one job and store the outcome."""
+    db = SessionLocal()
+    try:
+        if not _transition(db, job_id, "queued", status="running"):
+            return  # cancelled before it started
+        req = GenerateRequest.model_validate_json(db.get(GenerateJob, job_id).request_json)
+        sizes, assoc_scores, min_distances = load_plan_inputs(req, db)
+        cost = estimate_cost(req, sizes, min_distances)
+        cost.route = "job"
+
+        def progress(done: int, total: int) -> None:
+            if not _transition(db, job_id, "running", progress_done=done, progress_total=total):
+                raise JobCancelled
+
+        result = solve_plan(req, sizes, assoc_scores, min_distances, progress)
+        result.cost = cost
+        _transition(db, job_id, "running", status="done", result_json=dump_json(result).decode())
+    except JobCancelled:
+        pass
+    except Exception as e:
+        db.rollback()
+        _transition(db, job_id, "running", status="failed", error=str(e) or type(e).__name__)
+    finally:
+        db.close()
+
+
+def _start(job: GenerateJob, db: Session) -> None:
+    """Dispatch a queued job; if that fails, the job is marked failed."""
+    try:
+        _dispatch(job.id)
+    except Exception as e:
+        job.status = "failed"
+        job.error = f"Could not start job: {e or type(e).__name__}"
+        job.updated_at = time.time()
+        db.commit()
+
+
+def _dispatch(job_id: str) -> None:
+    future = submit(JOBS, run_job, job_id)
+    future.add_done_callback(lambda f: _on_worker_exit(job_id, f))
+
+
+def _on_worker_exit(job_id: str, future: Future) -> None:
+    """run_job records every outcome itself, so an exception here means the
+    worker process died (or the pool broke before the job started)."""
+    if future.cancelled() or future.exception() is None:
+        return
+    db = SessionLocal()
+    try:
+        if _transition(db, job_id, "running", status="failed", error="Worker process died"):
+            return
+        job = db.get(GenerateJob, job_id)
+        if job is not None and job.status == "queued":
+            _start(job, db)
+    finally:
+        db.close()
+
+
+def _transition(db: Session, job_id: str, expected: str, **values) -> bool:
+    """Update the job only if it is still in the expected status.
+    Returns whether it was."""
+    values["updated_at"] = time.time()
+    count = db.query(GenerateJob).filter_by(id=job_id, status=expected).update(
+        values, synchronize_session=False
+    )
+    db.commit()
+    return count == 1
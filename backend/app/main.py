@@ -2,16 +2,26 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .database import init_db
+from .compression import CompressionMiddleware
+from .database import SessionLocal, init_db
+from .jobs import cleanup_jobs, resume_jobs
 from .seed import run_seed
-from .routers import vegetables, associations, generate
+from .routers import vegetables, associations, generate, jobs
+from .workers import shutdown_pools
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
     run_seed()
+    db = SessionLocal()
+    try:
+        cleanup_jobs(db)
+    finally:
+        db.close()
+    resume_jobs()
     yield
+    shutdown_pools()
 
 
 app = FastAPI(title="GardenGen API", lifespan=lifespan)
@@ -22,7 +32,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
 
 app.include_router(vegetables.router)
 app.include_router(associations.router)
 app.include_router(generate.router)
+app.include_router(jobs.router)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, PrimaryKeyConstraint
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, PrimaryKeyConstraint, Text
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -25,7 +25,22 @@ class Association(Base):
     vegetable_id_main = Column(Integer, ForeignKey("vegetables.id"), nullable=False)
     vegetable_id_target = Column(Integer, ForeignKey("vegetables.id"), nullable=False)
     score = Column(Integer, nullable=False)  # -50 to +50
+    min_distance_cm = Column(Integer, nullable=False, default=0)  # 0 = no constraint
     reason = Column(String, default="")
 
     main = relationship("Vegetable", foreign_keys=[vegetable_id_main])
     target = relationship("Vegetable", foreign_keys=[vegetable_id_target])
+
+
+class GenerateJob(Base):
+    __tablename__ = "generate_jobs"
+
+    id = Column(String, primary_key=True)  # uuid4 hex
+    status = Column(String, nullable=False, default="queued")  # queued, running, done, failed, cancelled
+    request_json = Column(Text, nullable=False)
+    result_json = Column(Text, nullable=True)
+    error = Column(String, default="")
+    progress_done = Column(Integer, nullable=False, default=0)   # blocks placed
+    progress_total = Column(Integer, nullable=False, default=0)  # blocks to place
+    created_at = Column(Float, nullable=False)  # unix timestamps
+    updated_at = Column(Float, nullable=False)
@@ -0,0 +1,38 @@
+"""Fast JSON responses for the heavy routes.
+
+Pydantic models are serialized straight through pydantic-core (no
+re-validation against ``response_model``); plain containers go through
+orjson when it is installed, the stdlib encoder otherwise.
+"""
+
+import json
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def dump_json(content: Any) -> bytes:
+    if isinstance(content, BaseModel):
+        return pydantic_core.to_json(content)
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that trusts its content.
+
+    Returning an instance of this from a route makes FastAPI skip the
+    ``response_model`` validation step, so only use it for objects built by
+    our own code.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
@@ -21,6 +21,7 @@ def list_associations(db: Session = Depends(get_db)):
             vegetable_id_target=a.vegetable_id_target,
             score=a.score,
             reason=a.reason,
+            min_distance_cm=a.min_distance_cm,
             main_name=main.name if main else "",
             target_name=target.name if target else "",
         ))
@@ -44,6 +45,7 @@ def get_associations_for(vegetable_id: int, db: Session = Depends(get_db)):
             vegetable_id_target=a.vegetable_id_target,
             score=a.score,
             reason=a.reason,
+            min_distance_cm=a.min_distance_cm,
             main_name=main.name if main else "",
             target_name=target.name if target else "",
         ))
@@ -56,9 +58,13 @@ def upsert_association(data: AssociationCreate, db: Session = Depends(get_db)):
         vegetable_id_main=data.vegetable_id_main,
         vegetable_id_target=data.vegetable_id_target,
     ).first()
+    # min_distance_cm is left alone when the client does not send it
+    set_distance = "min_distance_cm" in data.model_fields_set
     if existing:
         existing.score = data.score
         existing.reason = data.reason
+        if set_distance:
+            existing.min_distance_cm = data.min_distance_cm
     else:
         existing = Association(**data.model_dump())
         db.add(existing)
@@ -70,12 +76,15 @@ def upsert_association(data: AssociationCreate, db: Session = Depends(get_db)):
     if reverse:
         reverse.score = data.score
         reverse.reason = data.reason
+        if set_distance:
+            reverse.min_distance_cm = data.min_distance_cm
     else:
         db.add(Association(
             vegetable_id_main=data.vegetable_id_target,
             vegetable_id_target=data.vegetable_id_main,
             score=data.score,
             reason=data.reason,
+            min_distance_cm=existing.min_distance_cm,
         ))
     db.commit()
     db.refresh(existing)
@@ -1,13 +1,45 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from ..config import COST_INLINE_MAX_OPS
 from ..database import get_db
 from ..schemas import GenerateRequest, GenerateResponse
-from ..algorithm import generate_plan
+from ..algorithm import load_plan_inputs, solve_plan
+from ..cost import estimate_cost, over_budget
+from ..decompose import plan_regions, solve_regions, split_ops
+from ..responses import FastJSONResponse
+from ..workers import GENERATE, submit
 
 router = APIRouter(prefix="/api", tags=["generate"])
 
 
-@router.post("/generate", response_model=GenerateResponse)
+@router.post("/generate", response_model=GenerateResponse, response_class=FastJSONResponse)
 def generate(req: GenerateRequest, db: Session = Depends(get_db)):
-    return generate_plan(req, db)
+    sizes, assoc_scores, min_distances = load_plan_inputs(req, db)
+    cost = estimate_cost(req, sizes, min_distances)
+    regions = None
+    if reason := over_budget(cost):
+        # Too expensive as one search: independent association clusters,
+        # solved side by side in their own regions, may still fit the budget
+        regions = plan_regions(req, sizes, assoc_scores, min_distances)
+        if regions is None:
+            raise HTTPException(413, reason)
+        cost.predicted_ops = split_ops(regions, sizes, min_distances)
+        if reason := over_budget(cost):
+            raise HTTPException(413, reason)
+
+    if regions is not None:
+        cost.route = "decomposed"
+        result = solve_regions(regions, sizes, assoc_scores, min_distances, parallel=True)
+    elif cost.predicted_ops <= COST_INLINE_MAX_OPS:
+        cost.route = "inline"
+        result = solve_plan(req, sizes, assoc_scores, min_distances)
+    else:
+        cost.route = "pool"
+        result = submit(
+            GENERATE, solve_plan, req, sizes, assoc_scores, min_distances
+        ).result()
+    result.cost = cost
+
+    # Returning the response directly skips response_model re-validation
+    return FastJSONResponse(result)
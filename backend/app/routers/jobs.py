@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session
+
+from ..config import JOB_MAX_OPS
+from ..database import get_db
+from ..models import GenerateJob
+from ..schemas import GenerateJobOut, GenerateRequest, GenerateResponse
+from ..algorithm import load_plan_inputs
+from ..cost import estimate_cost, over_budget
+from ..jobs import cancel_job, create_job
+
+router = APIRouter(prefix="/api/generate/jobs", tags=["jobs"])
+
+
+def _get_job(job_id: str, db: Session) -> GenerateJob:
+    job = db.get(GenerateJob, job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+    return job
+
+
+@router.post("", response_model=GenerateJobOut, status_code=202)
+def submit_job(req: GenerateRequest, db: Session = Depends(get_db)):
+    sizes, _, min_distances = load_plan_inputs(req, db)
+    cost = estimate_cost(req, sizes, min_distances)
+    if reason := over_budget(cost, JOB_MAX_OPS):
+        raise HTTPException(413, reason)
+    job = create_job(req, db)
+    if job.status == "failed":
+        raise HTTPException(503, job.error)
+    return job
+
+
+@router.get("/{job_id}", response_model=GenerateJobOut)
+def get_job(job_id: str, db: Session = Depends(get_db)):
+    return _get_job(job_id, db)
+
+
+@router.post("/{job_id}/cancel", response_model=GenerateJobOut)
+def cancel(job_id: str, db: Session = Depends(get_db)):
+    return cancel_job(_get_job(job_id, db), db)
+
+
+@router.get("/{job_id}/result", response_model=GenerateResponse)
+def get_job_result(job_id: str, db: Session = Depends(get_db)):
+    job = _get_job(job_id, db)
+    if job.status != "done":
+        raise HTTPException(409, f"Job is {job.status}")
+    # Stored JSON is sent as-is
+    return Response(content=job.result_json, media_type="application/json")
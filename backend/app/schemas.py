@@ -35,6 +35,7 @@ class AssociationBase(BaseModel):
     vegetable_id_target: int
     score: int
     reason: str = ""
+    min_distance_cm: int = Field(0, ge=0, le=2000)  # minimum spacing, 0 = none
 
 
 class AssociationCreate(AssociationBase):
@@ -70,7 +71,30 @@ class PlacedVegetable(BaseModel):
     h: int
 
 
+class CostEstimate(BaseModel):
+    grid_cells: int
+    total_quantity: int
+    demand_cells: int  # cells needed by all requested plants
+    fill_ratio: float  # demand_cells / grid_cells
+    predicted_ops: int
+    predicted_memory_bytes: int
+    route: str = ""  # "inline", "pool", "decomposed" or "job"
+
+
 class GenerateResponse(BaseModel):
     placed: list[PlacedVegetable]
     rejected: list[int]  # vegetable_ids that couldn't be placed
     global_score: float
+    cost: CostEstimate | None = None
+
+
+# ---------- Generate jobs ----------
+class GenerateJobOut(BaseModel):
+    id: str
+    status: str  # queued, running, done, failed, cancelled
+    progress_done: int
+    progress_total: int
+    error: str = ""
+    created_at: float
+    updated_at: float
+    model_config = {"from_attributes": True}
@@ -0,0 +1,62 @@
+"""Process pools for expensive generate requests and background jobs.
+
+Jobs get their own, smaller pool so long-running jobs can never take the
+workers that synchronous /api/generate requests are waiting on. If a worker
+process dies (OOM, kill), its executor is broken for good; it is replaced
+on the next submit.
+
+Workers are spawned, not forked: forking the multi-threaded server process
+can copy a lock held by another thread into the child and deadlock it, and
+a spawned worker opens its own database connections.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable
+
+from .config import JOB_WORKER_PROCESSES, WORKER_PROCESSES
+
+GENERATE = "generate"
+JOBS = "jobs"
+
+_SIZES = {GENERATE: WORKER_PROCESSES, JOBS: JOB_WORKER_PROCESSES}
+_pools: dict[str, ProcessPoolExecutor] = {}
+_lock = threading.Lock()
+_mp_context = multiprocessing.get_context("spawn")
+
+
+def submit(pool: str, fn: Callable, *args) -> Future:
+    """Run fn(*args) in the named pool, creating it on first use and
+    replacing it if it is broken."""
+    executor = _get(pool)
+    try:
+        return executor.submit(fn, *args)
+    except BrokenProcessPool:
+        _discard(pool, executor)
+        return _get(pool).submit(fn, *args)
+
+
+def shutdown_pools() -> None:
+    with _lock:
+        executors = list(_pools.values())
+        _pools.clear()
+    for executor in executors:
+        executor.shutdown(cancel_futures=True)
+
+
+def _get(pool: str) -> ProcessPoolExecutor:
+    with _lock:
+        if pool not in _pools:
+            _pools[pool] = ProcessPoolExecutor(
+                max_workers=_SIZES[pool], mp_context=_mp_context
+            )
+        return _pools[pool]
+
+
+def _discard(pool: str, executor: ProcessPoolExecutor) -> None:
+    with _lock:
+        if _pools.get(pool) is executor:
+            del _pools[pool]
+    executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,68 @@
+"""Benchmark response serialization for large plans.
+
+Usage: python bench_serialization.py [n_placements ...]
+
+Compares FastAPI's default path (validating and serializing against the
+response_model field with pydantic-core, then JSONResponse) with
+FastJSONResponse, and reports encoded / compressed sizes.
+"""
+
+import gzip
+import sys
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.utils import create_model_field
+
+from app.compression import brotli
+from app.config import BROTLI_QUALITY, GZIP_LEVEL
+from app.responses import dump_json, orjson
+from app.schemas import GenerateResponse, PlacedVegetable
+
+
+def _make_response(n: int) -> GenerateResponse:
+    placed = [
+        PlacedVegetable.model_construct(vegetable_id=i % 30 + 1, x=i % 400, y=i // 400, w=1, h=1)
+        for i in range(n)
+    ]
+    return GenerateResponse.model_construct(placed=placed, rejected=[7] * (n // 100), global_score=1234.0)
+
+
+def _timed(fn, repeat: int = 5) -> tuple[float, bytes]:
+    best = float("inf")
+    out = b""
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, out
+
+
+# What FastAPI builds for response_model=GenerateResponse
+_RESPONSE_FIELD = create_model_field("Response_generate", GenerateResponse, mode="serialization")
+
+
+def _default_path(resp: GenerateResponse) -> bytes:
+    value, errors = _RESPONSE_FIELD.validate(resp, {}, loc=("response",))
+    assert not errors, errors
+    return JSONResponse(_RESPONSE_FIELD.serialize(value, mode="json")).body
+
+
+def main(sizes: list[int]) -> None:
+    print(f"orjson: {'yes' if orjson else 'no'}   brotli: {'yes' if brotli else 'no'}")
+    for n in sizes:
+        resp = _make_response(n)
+        t_default, body_default = _timed(lambda: _default_path(resp))
+        t_fast, body = _timed(lambda: dump_json(resp))
+        t_gzip, gz = _timed(lambda: gzip.compress(body, compresslevel=GZIP_LEVEL))
+        print(f"\n{n} placements")
+        print(f"  default encode  {t_default:8.1f} ms  {len(body_default):>10} bytes")
+        print(f"  fast encode     {t_fast:8.1f} ms  {len(body):>10} bytes")
+        print(f"  gzip            {t_gzip:8.1f} ms  {len(gz):>10} bytes")
+        if brotli is not None:
+            t_br, br = _timed(lambda: brotli.compress(body, quality=BROTLI_QUALITY))
+            print(f"  brotli          {t_br:8.1f} ms  {len(br):>10} bytes")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 10_000, 50_000])
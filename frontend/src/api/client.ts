@@ -1,7 +1,7 @@
 import type {
   Vegetable, VegetableCreate,
   Association, AssociationCreate,
-  GenerateRequest, GenerateResponse,
+  GenerateRequest, GenerateResponse, GenerateJob,
 } from './types';
 
 const BASE = '/api';
@@ -52,4 +52,17 @@ export const api = {
   // Generate
   generate: (data: GenerateRequest) =>
     request<GenerateResponse>('/generate', { method: 'POST', body: JSON.stringify(data) }),
+
+  // Generate jobs
+  submitGenerateJob: (data: GenerateRequest) =>
+    request<GenerateJob>('/generate/jobs', { method: 'POST', body: JSON.stringify(data) }),
+
+  getGenerateJob: (id: string) =>
+    request<GenerateJob>(`/generate/jobs/${id}`),
+
+  cancelGenerateJob: (id: string) =>
+    request<GenerateJob>(`/generate/jobs/${id}/cancel`, { method: 'POST' }),
+
+  getGenerateJobResult: (id: string) =>
+    request<GenerateResponse>(`/generate/jobs/${id}/result`),
 };
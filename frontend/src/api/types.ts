@@ -22,6 +22,7 @@ export interface Association {
   vegetable_id_target: number;
   score: number;
   reason: string;
+  min_distance_cm?: number;
   main_name?: string;
   target_name?: string;
 }
@@ -31,6 +32,7 @@ export interface AssociationCreate {
   vegetable_id_target: number;
   score: number;
   reason: string;
+  min_distance_cm?: number;
 }
 
 export interface GenerateItem {
@@ -52,8 +54,29 @@ export interface PlacedVegetable {
   h: number;
 }
 
+export interface CostEstimate {
+  grid_cells: number;
+  total_quantity: number;
+  demand_cells: number;
+  fill_ratio: number;
+  predicted_ops: number;
+  predicted_memory_bytes: number;
+  route: string;
+}
+
 export interface GenerateResponse {
   placed: PlacedVegetable[];
   rejected: number[];
   global_score: number;
+  cost?: CostEstimate | null;
+}
+
+export interface GenerateJob {
+  id: string;
+  status: 'queued' | 'running' | 'done' | 'failed' | 'cancelled';
+  progress_done: number;
+  progress_total: number;
+  error: string;
+  created_at: number;
+  updated_at: number;
 }
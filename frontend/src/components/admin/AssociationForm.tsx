@@ -8,6 +8,7 @@ interface Props {
     vegetable_id_target: number;
     score: number;
     reason: string;
+    min_distance_cm?: number;
   }) => void;
   onCancel: () => void;
 }
@@ -17,6 +18,8 @@ export default function AssociationForm({ vegetables, onSave, onCancel }: Props)
   const [targetId, setTargetId] = useState(vegetables[1]?.id ?? 0);
   const [score, setScore] = useState(0);
   const [reason, setReason] = useState('');
+  // Empty = leave an existing spacing rule unchanged
+  const [minDistance, setMinDistance] = useState('');
 
   const handleSubmit = (e: React.FormEvent) => {
     e.preventDefault();
@@ -26,6 +29,7 @@ export default function AssociationForm({ vegetables, onSave, onCancel }: Props)
       vegetable_id_target: targetId,
       score,
       reason,
+      ...(minDistance !== '' && { min_distance_cm: Number(minDistance) }),
     });
   };
 
@@ -83,6 +87,18 @@ export default function AssociationForm({ vegetables, onSave, onCancel }: Props)
           className="w-full border rounded px-2 py-1 text-sm"
         />
       </div>
+      <div>
+        <label className="block text-xs text-gray-600 mb-1">Distance minimale (cm)</label>
+        <input
+          type="number"
+          min={0}
+          max={2000}
+          value={minDistance}
+          onChange={(e) => setMinDistance(e.target.value)}
+          placeholder="inchangee"
+          className="w-full border rounded px-2 py-1 text-sm"
+        />
+      </div>
       <div className="flex gap-2">
         <button type="submit" className="bg-green-600 text-white px-3 py-1 rounded text-sm hover:bg-green-700">
           Creer